@@ -61,29 +61,38 @@ def basic_pipeline_example():
     
     # Create mock JSONL data structure
     jsonl_data = []
-    for _, row in locations.iterrows():
+    # NER output keeps the row order of clean_tweets
+    texts = clean_tweets['no_multi_space_newlines'].fillna('').astype(str).to_numpy()
+    for text in texts:
         # Mock entity extraction results
         entities = []
-        if 'New Orleans' in str(row['no_multi_space_newlines']):
+        if 'New Orleans' in text:
             entities.append([0, 11, 'GPE'])  # Mock span for "New Orleans"
-        if 'Tampa' in str(row['no_multi_space_newlines']):
+        if 'Tampa' in text:
             entities.append([0, 5, 'GPE'])   # Mock span for "Tampa"
-        if 'Mobile' in str(row['no_multi_space_newlines']):
+        if 'Mobile' in text:
             entities.append([0, 6, 'GPE'])   # Mock span for "Mobile"
         
         jsonl_data.append({
-            'text': row['no_multi_space_newlines'],
+            'text': text,
             'label': entities
         })
     
     # Save to temporary JSONL file
-    import json
     import tempfile
     import os
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
+    try:
+        import orjson
+        dumps = orjson.dumps
+    except ImportError:
+        import json
+        dumps = lambda item: json.dumps(item).encode('utf-8')
+    
+    with tempfile.NamedTemporaryFile(mode='wb', suffix='.jsonl', delete=False) as f:
         for item in jsonl_data:
-            f.write(json.dumps(item) + '\n')
+            f.write(dumps(item))
+            f.write(b'\n')
         temp_jsonl_path = f.name
     
     # Step 4: Geocode and create maps
@@ -91,10 +100,10 @@ def basic_pipeline_example():
     try:
         geocoder = GeocodeTweetProcessor()
         
-        # Load and process the temporary JSONL file
-        ner_entities = geocoder.load_data(temp_jsonl_path)
-        processed_data = geocoder.process_entities(ner_entities, max_rows=10)
-        geocoded_data = geocoder.geocode_data(processed_data)
+        # Stream the temporary JSONL file in batches; each batch's new locations
+        # are geocoded while the next batch is read and processed
+        batches = geocoder.iter_data(temp_jsonl_path, chunksize=2)
+        geocoded_data = geocoder.geocode_batches(batches, max_rows=10)
         
         if len(geocoded_data) > 0:
             # Create GeoDataFrame and add state polygons
@@ -105,13 +114,13 @@ def basic_pipeline_example():
             geojson_path = "data/processed/example_output.geojson"
             final_gdf = geocoder.clean_and_export_geojson(gdf, geojson_path)
             
-            # Convert to Shapefile
+            # Write Shapefile from the same in-memory GeoDataFrame
             shapefile_path = "data/processed/example_output.shp"
-            geocoder.convert_to_shapefile(geojson_path, shapefile_path)
+            shapefile_paths = geocoder.export_shapefile(final_gdf, shapefile_path)
             
             print(f"Processing complete!")
             print(f"GeoJSON saved to: {geojson_path}")
-            print(f"Shapefile saved to: {shapefile_path}")
+            print(f"Shapefile saved to: {', '.join(shapefile_paths)}")
             print(f"Processed {len(final_gdf)} locations")
         else:
             print("No locations could be geocoded")
@@ -142,7 +151,7 @@ def command_line_example():
     
     print("\n4. Full pipeline with custom settings:")
     print("python -m text2map.core.text_processor --input tweets.csv --output-dir data/processed/")
-    print("python -m text2map.models.bert_ner --input data/processed/tweets_wo_gt.csv --confidence 0.8")
+    print("python -m text2map.models.bert_ner --input data/processed/tweets_wo_gt.parquet --confidence 0.8")
     print("python -m text2map.core.geocoder --input locations.jsonl --states Florida Alabama --max-rows 500")
 
 if __name__ == "__main__":
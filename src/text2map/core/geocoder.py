@@ -1,12 +1,27 @@
 import json
+import numpy as np
 import pandas as pd
 import geopandas as gpd
+import shapely
 import argparse
+import asyncio
 import os
+import shelve
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial
+from geopy.adapters import AioHTTPAdapter, RequestsAdapter
 from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
-from shapely.geometry import Point
+from geopy.exc import GeocoderTimedOut, GeopyError
+from geopy.extra.rate_limiter import AsyncRateLimiter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if int(shapely.__version__.split('.')[0]) < 2:
+    raise ImportError(f"text2map requires shapely>=2.0 (found {shapely.__version__})")
 
 class GeocodeTweetProcessor:
     """
@@ -14,13 +29,32 @@ class GeocodeTweetProcessor:
     No visualization - just data processing and geocoding.
     """
     
-    def __init__(self, shapefile_path=None):
-        """Initialize with shapefile path for state boundaries."""
+    def __init__(self, shapefile_path=None, cache_path=".geocache.db", min_delay_seconds=1.0, timeout=10):
+        """
+        Initialize with shapefile path for state boundaries.
+        
+        Args:
+            shapefile_path: Path to the state boundaries shapefile
+            cache_path: Persistent geocoding cache (shelve database), None to disable
+            min_delay_seconds: Minimum delay between Nominatim requests
+            timeout: Per-request geocoding timeout in seconds
+        """
         if shapefile_path is None:
             shapefile_path = os.path.join(os.path.dirname(__file__), "../../data/boundaries/countries/ne_110m_admin_1_states_provinces.shp")
         
         self.shapefile_path = shapefile_path
-        self.geolocator = Nominatim(user_agent="text2map_geocoder")
+        self.cache_path = cache_path
+        self.min_delay_seconds = min_delay_seconds
+        self.timeout = timeout
+        self.user_agent = "text2map_geocoder"
+        # Synchronous geolocator for geocode_address only (batch geocoding uses its
+        # own aiohttp session); pins the requests pool to one host, 16 connections
+        self.geolocator = Nominatim(
+            user_agent=self.user_agent,
+            adapter_factory=partial(RequestsAdapter, pool_connections=1, pool_maxsize=16)
+        )
+        self._states_by_crs = {}
+        self._state_geoms_by_crs = {}
         self.us_states = [
             "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware", 
             "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", 
@@ -30,79 +64,128 @@ class GeocodeTweetProcessor:
             "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont", 
             "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming"
         ]
-        self.us_states_lower = [state.lower() for state in self.us_states]
+        self.us_states_lower = frozenset(state.lower() for state in self.us_states)
+    
+    @cached_property
+    def _states_gdf(self):
+        """State boundaries, read from the shapefile on first use."""
+        return gpd.read_file(self.shapefile_path)
+    
+    def _states_in_crs(self, crs):
+        """State boundaries reprojected to ``crs``, cached per CRS."""
+        key = crs.to_string() if crs is not None else None
+        if key not in self._states_by_crs:
+            states = self._states_gdf
+            self._states_by_crs[key] = states if states.crs == crs else states.to_crs(crs)
+        return self._states_by_crs[key]
+    
+    def _state_geometries(self, crs):
+        """Mapping of lowercase state name to geometry in ``crs``, cached per CRS."""
+        key = crs.to_string() if crs is not None else None
+        if key not in self._state_geoms_by_crs:
+            states = self._states_in_crs(crs)
+            self._state_geoms_by_crs[key] = dict(zip(states['name'].str.lower(), states.geometry))
+        return self._state_geoms_by_crs[key]
     
     def load_data(self, file_path):
-        """Load NER entities from JSONL file."""
+        """
+        Load NER entities from JSONL file.
+        
+        Lines are parsed with orjson when it is installed (stdlib json otherwise).
+        Arrow's JSON reader is not used because the [start, end, type] label
+        spans mix integers and strings, which it cannot type.
+        """
         print(f"Loading data from: {file_path}")
-        ner_entities = pd.read_json(path_or_buf=file_path, lines=True)
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(file_path, 'rb') as f:
+            records = [loads(line) for line in f if line.strip()]
+        ner_entities = pd.DataFrame.from_records(records)
         print(f"Loaded {len(ner_entities)} tweets")
         return ner_entities
     
-    def extract_entities_by_type(self, row):
-        """Extract FAC, LOC, GPE entities from NER labels."""
-        fac = []
-        loc = []
-        gpe = []
-        
-        for start, end, entity_type in row['label']:
-            entity_text = row['text'][start:end]
-            if entity_type == "FAC":
-                fac.append(entity_text)
-            elif entity_type == "LOC":
-                loc.append(entity_text)
-            elif entity_type == "GPE":
-                gpe.append(entity_text)
-        
-        return {"FAC": fac, "LOC": loc, "GPE": gpe}
+    def iter_data(self, file_path, chunksize=10_000):
+        """Yield NER entities from a JSONL file as DataFrames of at most ``chunksize`` tweets."""
+        print(f"Streaming data from: {file_path}")
+        loads = orjson.loads if orjson is not None else json.loads
+        records = []
+        with open(file_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                records.append(loads(line))
+                if len(records) == chunksize:
+                    yield pd.DataFrame.from_records(records)
+                    records = []
+        if records:
+            yield pd.DataFrame.from_records(records)
+    
+    @staticmethod
+    def _extract_rows(texts, labels):
+        """
+        Extract joined FAC, LOC, GPE entity strings for every tweet in one pass.
+        
+        Hashes and surrounding whitespace are stripped from each entity, empty
+        entities are skipped, duplicates are removed, and FAC entities that also
+        appear as LOC are dropped. Each row's entities are sorted and joined
+        with ', '.
+        """
+        fac_rows = []
+        loc_rows = []
+        gpe_rows = []
+        
+        for text, spans in zip(texts, labels):
+            buckets = {"FAC": set(), "LOC": set(), "GPE": set()}
+            for start, end, entity_type in spans:
+                bucket = buckets.get(entity_type)
+                if bucket is None:
+                    continue
+                entity = text[start:end].replace('#', '').strip()
+                if entity:
+                    bucket.add(entity)
+            fac_rows.append(', '.join(sorted(buckets["FAC"] - buckets["LOC"])))
+            loc_rows.append(', '.join(sorted(buckets["LOC"])))
+            gpe_rows.append(', '.join(sorted(buckets["GPE"])))
+        
+        return fac_rows, loc_rows, gpe_rows
     
     def process_entities(self, ner_entities, max_rows=300):
         """Process and clean extracted entities."""
         print("Processing entities...")
         
-        ner_entities['extracted_entities'] = ner_entities.apply(self.extract_entities_by_type, axis=1)
-        
-        ner_entities['FAC'] = ner_entities['extracted_entities'].apply(lambda x: list(set(x['FAC'])))
-        ner_entities['LOC'] = ner_entities['extracted_entities'].apply(lambda x: list(set(x['LOC'])))
-        ner_entities['GPE'] = ner_entities['extracted_entities'].apply(lambda x: list(set(x['GPE'])))
-        
-        def remove_fac_loc_duplicates(row):
-            row['FAC'] = [entity for entity in row['FAC'] if entity not in row['LOC']]
-            return row
-        
-        ner_entities = ner_entities.apply(remove_fac_loc_duplicates, axis=1)
-        
-        ner_entities['FAC'] = ner_entities['FAC'].apply(lambda x: ', '.join(sorted(x)))
-        ner_entities['LOC'] = ner_entities['LOC'].apply(lambda x: ', '.join(sorted(x)))
-        ner_entities['GPE'] = ner_entities['GPE'].apply(lambda x: ', '.join(sorted(x)))
-        
-        result_df = ner_entities[['FAC', 'LOC', 'GPE']]
-        result_df = result_df.dropna(subset=['FAC', 'LOC', 'GPE'], how='all')
-        
-        columns_to_clean = ['FAC', 'LOC', 'GPE']
-        def remove_hash(value):
-            if isinstance(value, str):
-                return value.replace('#', '')
-            return value
-        
-        result_df[columns_to_clean] = result_df[columns_to_clean].applymap(remove_hash)
-        
-        df_cleaned = result_df.groupby(["FAC", "LOC", "GPE"]).size().reset_index(name='count')
+        fac_rows, loc_rows, gpe_rows = self._extract_rows(
+            ner_entities['text'].to_numpy(), ner_entities['label'].to_numpy()
+        )
+        result_df = pd.DataFrame({'FAC': fac_rows, 'LOC': loc_rows, 'GPE': gpe_rows})
         
-        for col in ["FAC", "LOC", "GPE"]:
-            df_cleaned[col] = df_cleaned[col].str.strip(" ,")
+        # Tweets without any location entity do not form a group
+        result_df = result_df[(result_df != '').any(axis=1)]
         
-        df_cleaned = df_cleaned.iloc[1:].reset_index(drop=True)
+        # Group on categorical codes rather than hashing Python strings per row
+        columns = ["FAC", "LOC", "GPE"]
+        result_df = result_df.astype({col: 'category' for col in columns})
+        df_cleaned = result_df.groupby(columns, observed=True, sort=False).size().reset_index(name='count')
+        # Arrow-backed strings so later .str/isin calls run on Arrow kernels
+        df_cleaned = df_cleaned.astype({col: pd.StringDtype('pyarrow') for col in columns})
         data = df_cleaned[:max_rows] if max_rows else df_cleaned
         
         print(f"Processed {len(data)} unique location combinations")
         return data
     
+    @staticmethod
+    def build_address(row):
+        """Build the geocoder query string from FAC, LOC, GPE components."""
+        return f"{row['FAC']}, {row['LOC']}, {row['GPE']}"
+    
+    @staticmethod
+    def _cache_key(address):
+        """Normalize an address into its cache key."""
+        return address.lower().strip()
+    
     def geocode_address(self, row):
         """Geocode address from FAC, LOC, GPE components."""
         try:
-            address = f"{row['FAC']}, {row['LOC']}, {row['GPE']}"
-            location = self.geolocator.geocode(address, timeout=10)
+            address = self.build_address(row)
+            location = self.geolocator.geocode(address, timeout=self.timeout)
             if location:
                 return pd.Series([location.latitude, location.longitude])
             else:
@@ -110,10 +193,89 @@ class GeocodeTweetProcessor:
         except GeocoderTimedOut:
             return pd.Series([None, None])
     
+    async def _geocode_many(self, addresses):
+        """
+        Geocode unique addresses concurrently under the Nominatim rate limit.
+        
+        Returns a dict of address -> (latitude, longitude); addresses that were
+        not found map to (None, None), addresses that failed are left out so
+        they are retried on the next run instead of being cached.
+        """
+        results = {}
+        async with Nominatim(user_agent=self.user_agent, adapter_factory=AioHTTPAdapter) as geolocator:
+            geocode = AsyncRateLimiter(
+                geolocator.geocode,
+                min_delay_seconds=self.min_delay_seconds,
+                max_retries=2,
+                swallow_exceptions=False
+            )
+            
+            async def _geocode_one(address):
+                try:
+                    location = await geocode(address, timeout=self.timeout)
+                except GeopyError as e:
+                    print(f"Geocoding failed for '{address}': {e}")
+                    return
+                if location:
+                    results[address] = (location.latitude, location.longitude)
+                else:
+                    results[address] = (None, None)
+            
+            await asyncio.gather(*[_geocode_one(address) for address in addresses])
+        return results
+    
+    @staticmethod
+    def _run_coroutine(coro):
+        """
+        Run a coroutine to completion and return its result.
+        
+        asyncio.run() cannot be called while an event loop is running (Jupyter,
+        async callers), so in that case the coroutine gets its own loop on a
+        worker thread.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return executor.submit(asyncio.run, coro).result()
+        # Run outside the except block so errors raised while geocoding are not
+        # chained to the "no running event loop" RuntimeError
+        return asyncio.run(coro)
+    
     def geocode_data(self, data):
-        """Apply geocoding to all rows."""
+        """
+        Apply geocoding to all rows.
+        
+        Repeated addresses are geocoded once, previously seen addresses are
+        served from the persistent cache, and the remaining ones are sent to
+        Nominatim concurrently.
+        """
         print("Geocoding addresses...")
-        data[['Latitude', 'Longitude']] = data.apply(self.geocode_address, axis=1)
+        addresses = data['FAC'] + ', ' + data['LOC'] + ', ' + data['GPE']
+        keys = addresses.str.lower().str.strip()
+        unique_addresses = dict(zip(keys, addresses))
+        
+        cache = shelve.open(self.cache_path) if self.cache_path else {}
+        try:
+            coords = {key: cache[key] for key in unique_addresses if key in cache}
+            misses = [key for key in unique_addresses if key not in coords]
+            print(f"{len(unique_addresses)} unique addresses: {len(coords)} cached, {len(misses)} to geocode")
+            
+            if misses:
+                fetched = self._run_coroutine(self._geocode_many([unique_addresses[key] for key in misses]))
+                for key in misses:
+                    address = unique_addresses[key]
+                    if address in fetched:
+                        coords[key] = fetched[address]
+                        cache[key] = fetched[address]
+        finally:
+            if self.cache_path:
+                cache.close()
+        
+        data['Latitude'] = keys.map({key: lat for key, (lat, lon) in coords.items()})
+        data['Longitude'] = keys.map({key: lon for key, (lat, lon) in coords.items()})
         
         df = pd.DataFrame(data)
         df = df.dropna(subset=['Latitude', 'Longitude'])
@@ -121,20 +283,66 @@ class GeocodeTweetProcessor:
         
         return df
     
+    def geocode_batches(self, batches, max_rows=300):
+        """
+        Process and geocode batches of NER entities as they arrive.
+        
+        Gives the same result as geocode_data(process_entities(all_batches, max_rows)):
+        group counts are accumulated across batches in first-seen order and only
+        the first ``max_rows`` groups are kept. Groups first seen in a batch are
+        geocoded on a worker thread while the next batch is read and processed,
+        so upstream work (JSONL parsing, NER) overlaps the network-bound geocoding.
+        """
+        print("Processing and geocoding entities in batches...")
+        columns = ["FAC", "LOC", "GPE"]
+        string_dtypes = {col: pd.StringDtype('pyarrow') for col in columns}
+        counts = {}
+        futures = []
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for batch in batches:
+                fac_rows, loc_rows, gpe_rows = self._extract_rows(
+                    batch['text'].to_numpy(), batch['label'].to_numpy()
+                )
+                new_groups = []
+                for group in zip(fac_rows, loc_rows, gpe_rows):
+                    if group in counts:
+                        counts[group] += 1
+                    elif group != ('', '', '') and (not max_rows or len(counts) < max_rows):
+                        counts[group] = 1
+                        new_groups.append(group)
+                if new_groups:
+                    new_data = pd.DataFrame(new_groups, columns=columns).astype(string_dtypes)
+                    futures.append(executor.submit(self.geocode_data, new_data))
+            geocoded = [future.result() for future in futures]
+        
+        data = pd.DataFrame(list(counts), columns=columns).astype(string_dtypes)
+        data['count'] = list(counts.values())
+        print(f"Processed {len(data)} unique location combinations")
+        
+        if not geocoded:
+            return data.assign(Latitude=pd.Series(dtype=float), Longitude=pd.Series(dtype=float))
+        coords = pd.concat(geocoded)[columns + ['Latitude', 'Longitude']].astype({'Latitude': float, 'Longitude': float})
+        df = data.merge(coords, on=columns, how='inner')
+        print(f"Successfully geocoded {len(df)} locations in total")
+        
+        return df
+    
     def create_geodataframe(self, df, target_states=None):
         """Create GeoDataFrame and filter by target states."""
-        geometry = [Point(xy) for xy in zip(df['Longitude'], df['Latitude'])]
-        gdf = gpd.GeoDataFrame(df, geometry=geometry, crs="EPSG:4326")
+        geometry = gpd.points_from_xy(
+            df['Longitude'].to_numpy(dtype=np.float64),
+            df['Latitude'].to_numpy(dtype=np.float64),
+            crs="EPSG:4326"
+        )
+        gdf = gpd.GeoDataFrame(df, geometry=geometry)
         
         if target_states:
             print(f"Filtering data for states: {target_states}")
             
-            cultural_gdf = gpd.read_file(self.shapefile_path)
+            cultural_gdf = self._states_in_crs(gdf.crs)
             selected_states = cultural_gdf[cultural_gdf['name'].isin(target_states)]
             
-            if gdf.crs != selected_states.crs:
-                selected_states = selected_states.to_crs(gdf.crs)
-            
             filtered_gdf = gpd.sjoin(gdf, selected_states, how='inner', predicate='within')
             columns_to_keep = ['FAC', 'LOC', 'GPE', 'count', 'Latitude', 'Longitude', 'geometry']
             gdf = filtered_gdf[columns_to_keep]
@@ -154,62 +362,101 @@ class GeocodeTweetProcessor:
         """Add state polygon geometries for state-only entries."""
         print("Adding state polygons...")
         
-        gdf['make_polygon'] = gdf.apply(
-            lambda row: 1 if (row['FAC'] == '' and row['LOC'] == '' and self.contains_us_state_exact(row['GPE'])) else 0, 
-            axis=1
+        gpe_lower = gdf['GPE'].str.lower().str.strip()
+        state_only = (
+            (gdf['FAC'].str.len() == 0)
+            & (gdf['LOC'].str.len() == 0)
+            & gpe_lower.isin(self.us_states_lower)
         )
-        
-        cultural_gdf = gpd.read_file(self.shapefile_path)
-        cultural_gdf['name'] = cultural_gdf['name'].str.lower()
-        
-        gdf['GPE_lower'] = gdf['GPE'].str.lower().str.strip()
-        gdf = gdf.merge(
-            cultural_gdf[['name', 'geometry']],
-            left_on='GPE_lower',
-            right_on='name',
-            how='left'
+        gdf['make_polygon'] = state_only.astype('int8')
+        
+        # Points are kept for every row that is not a state-only mention; both
+        # sides stay GeometryArrays so no object-dtype column is materialized
+        polygons = gpd.GeoSeries(
+            gpe_lower.where(state_only).map(self._state_geometries(gdf.crs)),
+            index=gdf.index,
+            crs=gdf.crs
         )
+        gdf['geometry'] = gdf.geometry.where(~state_only, polygons)
         
-        gdf.loc[gdf['make_polygon'] == 1, 'geometry'] = gdf.loc[gdf['make_polygon'] == 1, 'geometry_y']
-        gdf = gdf.drop(columns=['GPE_lower', 'name', 'geometry_y'], errors='ignore')
-        
-        polygon_count = len(gdf[gdf['make_polygon'] == 1])
+        polygon_count = int(state_only.sum())
         print(f"Added {polygon_count} state polygons")
         
         return gdf
     
     def clean_and_export_geojson(self, gdf, output_path="data/processed/geometry.geojson"):
-        """Clean geometry columns and export to GeoJSON."""
-        print("Cleaning geometry and exporting to GeoJSON...")
+        """
+        Clean geometry columns and export to GeoJSON.
         
-        gdf1 = gdf.copy()
-        gdf1 = gdf1.set_geometry("geometry")
+        The input frame is not copied: when there are no auxiliary geometry_*
+        columns to drop, it is returned (with 'geometry' set as the active
+        geometry column) instead of a duplicate.
+        """
+        print("Cleaning geometry and exporting to GeoJSON...")
         
-        columns_to_drop = [col for col in gdf1.columns if col.startswith('geometry_') and col != 'geometry']
-        if columns_to_drop:
-            gdf1 = gdf1.drop(columns=columns_to_drop)
+        columns_to_drop = [col for col in gdf.columns if col.startswith('geometry_') and col != 'geometry']
+        gdf1 = gdf.drop(columns=columns_to_drop) if columns_to_drop else gdf
+        gdf1.set_geometry("geometry", inplace=True)
         
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        gdf1.to_file(output_path, driver="GeoJSON")
+        gdf1.to_file(output_path, driver="GeoJSON", engine="pyogrio")
         print(f"Exported cleaned GeoDataFrame to: {output_path}")
         
         return gdf1
     
+    def export_shapefile(self, gdf, shapefile_path):
+        """
+        Write an in-memory GeoDataFrame to Shapefile.
+        
+        A Shapefile holds a single geometry kind, so mixed point/polygon data is
+        split into ``<name>_point.shp`` and ``<name>_polygon.shp``.
+        Returns the list of written paths.
+        """
+        os.makedirs(os.path.dirname(shapefile_path) or ".", exist_ok=True)
+        
+        kinds = gdf.geom_type.str.replace('Multi', '', regex=False)
+        present = kinds.dropna().unique()
+        if len(present) <= 1:
+            gdf.to_file(shapefile_path, driver='ESRI Shapefile', engine="pyogrio")
+            print(f"Shapefile saved to: {shapefile_path}")
+            return [shapefile_path]
+        
+        base_name, ext = os.path.splitext(shapefile_path)
+        written = []
+        for kind in present:
+            path = f"{base_name}_{kind.lower()}{ext}"
+            gdf[kinds == kind].to_file(path, driver='ESRI Shapefile', engine="pyogrio")
+            print(f"Shapefile saved to: {path}")
+            written.append(path)
+        
+        return written
+    
+    def export_geoparquet(self, gdf, output_path):
+        """Write an in-memory GeoDataFrame to GeoParquet."""
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        gdf.to_parquet(output_path)
+        print(f"GeoParquet saved to: {output_path}")
+        
+        return output_path
+    
     def convert_to_shapefile(self, geojson_path, shapefile_path=None):
-        """Convert GeoJSON to Shapefile."""
+        """
+        Convert an existing GeoJSON file to Shapefile.
+        
+        Returns the list of written paths (see export_shapefile).
+        """
         print("Converting GeoJSON to Shapefile...")
         
         if shapefile_path is None:
             base_name = os.path.splitext(geojson_path)[0]
             shapefile_path = f"{base_name}.shp"
         
-        gdf = gpd.read_file(geojson_path)
-        gdf.to_file(shapefile_path, driver='ESRI Shapefile')
+        gdf = gpd.read_file(geojson_path, engine="pyogrio")
+        written = self.export_shapefile(gdf, shapefile_path)
         
         print(f"GeoJSON converted to Shapefile successfully!")
-        print(f"Shapefile saved to: {shapefile_path}")
         
-        return shapefile_path
+        return written
 
 def main():
     """Main execution function."""
@@ -219,34 +466,38 @@ def main():
     parser.add_argument("--shapefile", help="Shapefile path")
     parser.add_argument("--states", nargs="+", help="Target states to filter (e.g., Florida Georgia)")
     parser.add_argument("--max-rows", type=int, default=300, help="Maximum rows to process")
+    parser.add_argument("--chunksize", type=int, default=10_000, help="Tweets read and processed per batch while geocoding runs")
     parser.add_argument("--output-dir", default="data/processed", help="Output directory")
     parser.add_argument("--geojson-name", default="geometry.geojson", help="GeoJSON output filename")
     parser.add_argument("--shapefile-name", help="Shapefile output filename")
     parser.add_argument("--skip-shapefile", action="store_true", help="Skip shapefile conversion")
+    parser.add_argument("--geoparquet-name", help="GeoParquet output filename")
+    parser.add_argument("--skip-geoparquet", action="store_true", help="Skip GeoParquet export")
+    parser.add_argument("--cache-path", default=".geocache.db", help="Persistent geocoding cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the persistent geocoding cache")
     
     args = parser.parse_args()
     
     os.makedirs(args.output_dir, exist_ok=True)
     
-    processor = GeocodeTweetProcessor(args.shapefile)
+    processor = GeocodeTweetProcessor(args.shapefile, cache_path=None if args.no_cache else args.cache_path)
     
-    ner_entities = processor.load_data(args.input)
-    processed_data = processor.process_entities(ner_entities, args.max_rows)
-    geocoded_data = processor.geocode_data(processed_data)
+    batches = processor.iter_data(args.input, args.chunksize)
+    geocoded_data = processor.geocode_batches(batches, args.max_rows)
     gdf = processor.create_geodataframe(geocoded_data, args.states)
     gdf = processor.add_state_polygons(gdf)
     
     geojson_path = os.path.join(args.output_dir, args.geojson_name)
     final_gdf = processor.clean_and_export_geojson(gdf, geojson_path)
+    base_name = os.path.splitext(args.geojson_name)[0]
+    
+    if not args.skip_geoparquet:
+        geoparquet_name = args.geoparquet_name or f"{base_name}.parquet"
+        processor.export_geoparquet(final_gdf, os.path.join(args.output_dir, geoparquet_name))
     
     if not args.skip_shapefile:
-        if args.shapefile_name:
-            shapefile_path = os.path.join(args.output_dir, args.shapefile_name)
-        else:
-            base_name = os.path.splitext(args.geojson_name)[0]
-            shapefile_path = os.path.join(args.output_dir, f"{base_name}.shp")
-        
-        processor.convert_to_shapefile(geojson_path, shapefile_path)
+        shapefile_name = args.shapefile_name or f"{base_name}.shp"
+        processor.export_shapefile(final_gdf, os.path.join(args.output_dir, shapefile_name))
     
     csv_path = os.path.join(args.output_dir, "processed_locations.csv")
     final_gdf.to_csv(csv_path, index=False)
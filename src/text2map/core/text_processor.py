@@ -2,6 +2,51 @@ import pandas as pd
 import re
 import argparse
 import os
+from functools import lru_cache, partial
+from itertools import chain
+from multiprocessing import Pool
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Emoji ranges for removal
+EMOJI_RANGES = (
+    "["
+    u"\U0001F600-\U0001F64F"  # emoticons
+    u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+    u"\U0001F680-\U0001F6FF"  # transport & map symbols
+    u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    u"\U00002702-\U000027B0"  # miscellaneous symbols
+    u"\U000024C2-\U0001F251"  # enclosed characters
+    u"\U00010000-\U0010FFFF"  # supplementary planes
+    "]+"
+)
+
+# Fused patterns: a leading 'RT ' and/or '@handle:' prefix, then links and
+# emojis anywhere in the text, then runs of whitespace
+PREFIX_PATTERN = r'^(?:RT )?(?:@\w+:\s*)?'
+NOISE_PATTERN = r'http\S+|' + EMOJI_RANGES
+SPACE_PATTERN = r'\s+'
+
+@lru_cache(maxsize=None)
+def _compile_patterns(use_re2):
+    """Compile the fused cleaning patterns once per process and engine."""
+    engine = re2 if use_re2 else re
+    return (
+        engine.compile(PREFIX_PATTERN),
+        engine.compile(NOISE_PATTERN),
+        engine.compile(SPACE_PATTERN)
+    )
+
+def _clean_chunk(texts, use_re2=False):
+    """Clean a list of strings; module-level so it can run in worker processes."""
+    prefix_pattern, noise_pattern, space_pattern = _compile_patterns(use_re2)
+    return [
+        space_pattern.sub(' ', noise_pattern.sub('', prefix_pattern.sub('', text))).strip()
+        for text in texts
+    ]
 
 class TweetProcessor:
     """
@@ -9,34 +54,32 @@ class TweetProcessor:
     Outputs cleaned tweets ready for further NER processing.
     """
     
-    def __init__(self):
-        """Initialize the tweet processor."""
-        # Emoji pattern for removal
-        self.emoji_pattern = re.compile(
-            "["
-            u"\U0001F600-\U0001F64F"  # emoticons
-            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-            u"\U0001F680-\U0001F6FF"  # transport & map symbols
-            u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
-            u"\U00002702-\U000027B0"  # miscellaneous symbols
-            u"\U000024C2-\U0001F251"  # enclosed characters
-            u"\U00010000-\U0010FFFF"  # supplementary planes
-            "]+", 
-            flags=re.UNICODE
-        )
-    
-    def remove_rt(self, text):
-        """Function to remove 'RT' if it's the first word."""
-        if isinstance(text, str) and text.startswith("RT "):
-            return text[3:]
-        return text if isinstance(text, str) else ""
-    
-    def remove_first_handle(self, text):
-        """Function to remove '@handle:' if it's the first word in the text."""
+    def __init__(self, use_re2=False, n_jobs=1):
+        """
+        Initialize the tweet processor.
+        
+        Args:
+            use_re2: Clean text with Google RE2 (linear-time matching, no backtracking)
+                instead of the built-in re module. Off by default: per-call overhead
+                in the RE2 wrapper makes it slower than re on tweet-length strings,
+                and RE2's \w and \s only match ASCII, so handles with accented
+                letters are not stripped and non-ASCII spaces (NBSP, em space) and
+                vertical tabs are not collapsed.
+            n_jobs: Number of worker processes used to clean text (-1 for all CPUs)
+        """
+        if use_re2 and re2 is None:
+            raise ImportError("use_re2=True requires the google-re2 package")
+        self.use_re2 = use_re2
+        self.n_jobs = os.cpu_count() if n_jobs == -1 else max(1, n_jobs)
+        
+        self.emoji_pattern = re.compile(EMOJI_RANGES, flags=re.UNICODE)
+        self.prefix_pattern, self.noise_pattern, self.space_pattern = _compile_patterns(self.use_re2)
+    
+    def remove_rt_and_handle(self, text):
+        """Remove a leading 'RT ' and/or '@handle:' prefix with one anchored regex."""
         if not isinstance(text, str):
             return ""
-        text = re.sub(r'^@\w+:\s*', '', text)
-        return text
+        return self.prefix_pattern.sub('', text)
     
     def remove_emojis(self, text):
         """Remove emojis from text using regex pattern."""
@@ -58,6 +101,18 @@ class TweetProcessor:
         text = re.sub(r'\s+', ' ', text).strip()
         return text
     
+    def clean_text(self, text):
+        """Apply all cleaning steps to a single string using the fused patterns."""
+        return _clean_chunk([text], self.use_re2)[0]
+    
+    def _clean_parallel(self, texts):
+        """Clean a list of strings across ``n_jobs`` worker processes, keeping order."""
+        chunk_size = max(1, -(-len(texts) // (self.n_jobs * 4)))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        with Pool(self.n_jobs) as pool:
+            cleaned = pool.imap(partial(_clean_chunk, use_re2=self.use_re2), chunks)
+            return list(chain.from_iterable(cleaned))
+    
     def process_dataframe(self, df):
         """
         Process the entire dataframe through all cleaning steps.
@@ -77,39 +132,52 @@ class TweetProcessor:
             'text': 'tweet'
         })
         
-        # Step 1: Remove RT
-        print("Step 1: Removing RT...")
-        tweet['no_rt_text'] = tweet['tweet'].apply(self.remove_rt)
+        # Missing text becomes an empty string
+        text = tweet['tweet'].astype('string').fillna('')
+        
+        if self.n_jobs > 1:
+            print(f"Cleaning text with {self.n_jobs} processes...")
+            tweet['no_multi_space_newlines'] = self._clean_parallel(text.tolist())
+            print("Processing complete!")
+            return tweet
         
-        # Step 2: Remove first handle
-        print("Step 2: Removing first handle...")
-        tweet['no_handle'] = tweet['no_rt_text'].apply(self.remove_first_handle)
+        if self.use_re2:
+            # RE2 patterns are not accepted by Series.str, so run them per string
+            print("Cleaning text with RE2...")
+            tweet['no_multi_space_newlines'] = _clean_chunk(text.tolist(), True)
+            print("Processing complete!")
+            return tweet
         
-        # Step 3: Remove emojis
-        print("Step 3: Removing emojis...")
-        tweet['no_emoji_text'] = tweet['no_handle'].apply(self.remove_emojis)
+        # Step 1: Remove leading RT and first handle
+        print("Step 1: Removing RT and first handle...")
+        text = text.str.replace(self.prefix_pattern, '', regex=True)
         
-        # Step 4: Remove links
-        print("Step 4: Removing links...")
-        tweet['no_links'] = tweet['no_emoji_text'].apply(self.remove_links)
+        # Step 2: Remove links and emojis in a single scan
+        print("Step 2: Removing links and emojis...")
+        text = text.str.replace(self.noise_pattern, '', regex=True)
         
-        # Step 5: Normalize spaces and newlines
-        print("Step 5: Normalizing spaces and newlines...")
-        tweet['no_multi_space_newlines'] = tweet['no_links'].apply(self.remove_space_newlines)
+        # Step 3: Normalize spaces and newlines
+        print("Step 3: Normalizing spaces and newlines...")
+        tweet['no_multi_space_newlines'] = text.str.replace(self.space_pattern, ' ', regex=True).str.strip()
         
         print("Processing complete!")
         return tweet
     
     def save_processed_tweets(self, tweet_df, output_path):
         """
-        Save processed tweets to CSV file.
+        Save processed tweets to a zstd-compressed Parquet file, or CSV.
         
         Args:
             tweet_df: Processed DataFrame
-            output_path: Path to save the CSV file
+            output_path: Path to save to; a '.parquet' suffix writes Parquet,
+                anything else writes CSV
         """
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-        tweet_df[['id', 'time', 'no_multi_space_newlines']].to_csv(output_path, index=False)
+        output_df = tweet_df[['id', 'time', 'no_multi_space_newlines']]
+        if output_path.endswith('.parquet'):
+            output_df.to_parquet(output_path, engine='pyarrow', compression='zstd', index=False)
+        else:
+            output_df.to_csv(output_path, index=False)
         print(f"Processed tweets saved to: {output_path}")
 
 def main():
@@ -117,8 +185,11 @@ def main():
     parser = argparse.ArgumentParser(description="Process tweets by cleaning text (remove RT, handles, emojis, links)")
     
     parser.add_argument("--input", "-i", required=True, help="Input CSV file (e.g., francine.csv)")
-    parser.add_argument("--output", "-o", help="Output CSV file (default: data/processed/{input_name}_wo_gt.csv)")
+    parser.add_argument("--output", "-o", help="Output file, Parquet or CSV by suffix (default: data/processed/{input_name}_wo_gt.{format})")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet", help="Default output format (default: parquet)")
     parser.add_argument("--output-dir", default="data/processed", help="Output directory (default: data/processed)")
+    parser.add_argument("--re2", action="store_true", help="Clean text with google-re2 instead of Python's re module (ASCII-only \\w and \\s)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for text cleaning (-1 for all CPUs)")
     
     args = parser.parse_args()
     
@@ -128,7 +199,7 @@ def main():
     
     if not args.output:
         input_name = os.path.splitext(os.path.basename(args.input))[0]
-        args.output = os.path.join(args.output_dir, f"{input_name}_wo_gt.csv")
+        args.output = os.path.join(args.output_dir, f"{input_name}_wo_gt.{args.format}")
     
     print(f"Loading data from: {args.input}")
     try:
@@ -146,7 +217,7 @@ def main():
         print(f"Error loading CSV file: {e}")
         return
     
-    processor = TweetProcessor()
+    processor = TweetProcessor(use_re2=args.re2, n_jobs=args.jobs)
     
     try:
         processed_tweet_df = processor.process_dataframe(df)
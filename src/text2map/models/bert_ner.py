@@ -1,20 +1,50 @@
 import torch
-from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
+from transformers import AutoTokenizer, AutoModelForTokenClassification
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import argparse
 import os
-from typing import List, Dict, Any
+import time
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterator, Mapping, Tuple
 import json
 
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
 class BERTNERInference:
     """BERT NER inference for location and event extraction from tweets."""
     
-    def __init__(self, model_path: str = None):
+    def __init__(
+        self,
+        model_path: str = None,
+        batch_size: int = None,
+        dtype: torch.dtype = None,
+        compile_model: bool = False,
+        quantize: bool = False
+    ):
         """
         Initialize BERT NER model for inference.
         
         Args:
             model_path: Path to trained BERT model directory
+            batch_size: Number of texts per forward pass in process_dataframe
+                (default: the largest probed size that fits in GPU memory, 1 on CPU)
+            dtype: Model weight dtype (default: bfloat16 on GPUs that support it,
+                float16 on other GPUs, float32 on CPU)
+            compile_model: Compile the model with torch.compile (CUDA graphs on GPU).
+                Inputs are then padded to multiples of 32 tokens so only a few shapes
+                get compiled, and a warmup pass pays the compile cost up front.
+            quantize: On CPU, convert the Linear layers of a float32 model to dynamic
+                int8 quantization. Faster, but predictions are approximate: besides
+                shifted confidences, tokens can change label, so extracted spans and
+                per-class counts may differ from the float32 model. Skipped when
+                compile_model is set.
         """
         if model_path is None:
             model_path = os.path.join(os.path.dirname(__file__), "../../data/models/bert_ner")
@@ -22,32 +52,137 @@ class BERTNERInference:
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         print(f"Using device: {self.device}")
         
+        self.batch_size = batch_size if batch_size is not None else 1
+        
+        if dtype is None:
+            if self.device.type == "cuda":
+                dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            else:
+                dtype = torch.float32
+        self.dtype = dtype
+        print(f"Using dtype: {self.dtype}")
+        
+        # Stream the weights straight onto the device instead of building a
+        # randomly initialised model on the CPU and copying into it
+        load_kwargs = dict(torch_dtype=self.dtype, low_cpu_mem_usage=True, device_map={"": self.device})
+        if os.path.isdir(model_path) and not os.path.exists(os.path.join(model_path, "model.safetensors")):
+            print("No model.safetensors found; converting the checkpoint makes loading faster (see README)")
+        
+        self.model = AutoModelForTokenClassification.from_pretrained(model_path, **load_kwargs)
+        self.model.eval()
+        self.model.requires_grad_(False)
+        print(f"Loaded model from: {model_path}")
+        
+        if quantize and self.device.type == "cpu" and self.dtype == torch.float32:
+            if compile_model:
+                print("Skipping int8 quantization: not supported together with torch.compile")
+            else:
+                self.model = torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+                print("Quantized Linear layers to int8 for CPU inference")
+        
+        # Checkpoints saved without tokenizer files fall back to the base tokenizer
+        tokenizer_path = model_path
+        tokenizer_files = ("tokenizer.json", "tokenizer_config.json", "vocab.txt")
+        if os.path.isdir(model_path) and not any(os.path.exists(os.path.join(model_path, f)) for f in tokenizer_files):
+            print(f"No tokenizer files in {model_path}")
+            tokenizer_path = "bert-base-cased"
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-            self.model = AutoModelForTokenClassification.from_pretrained(model_path)
-            self.model.to(self.device)
-            self.model.eval()
-            print(f"Loaded model from: {model_path}")
+            self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
         except Exception as e:
-            print(f"Error loading model: {e}")
-            print("Trying to load bert-base-cased tokenizer...")
-            self.tokenizer = AutoTokenizer.from_pretrained("bert-base-cased")
-            self.model = AutoModelForTokenClassification.from_pretrained(model_path)
-            self.model.to(self.device)
-            self.model.eval()
-        
-        self.ner_pipeline = pipeline(
-            "ner",
-            model=self.model,
-            tokenizer=self.tokenizer,
-            device=0 if torch.cuda.is_available() else -1,
-            aggregation_strategy="simple"
+            print(f"Error loading tokenizer: {e}")
+            tokenizer_path = "bert-base-cased"
+            self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
+        print(f"Loaded tokenizer from: {tokenizer_path}")
+        
+        # Inputs are truncated to what both the tokenizer and the position embeddings allow
+        self._max_length = min(
+            self.tokenizer.model_max_length,
+            getattr(self.model.config, "max_position_embeddings", self.tokenizer.model_max_length)
         )
         
+        # Autotuned batch sizes are re-probed when a chunk has longer texts than
+        # the length they were probed at. A compiled model recompiles for every new
+        # shape, so it is probed once at the maximum length before compiling instead
+        self._autotune = batch_size is None and self.device.type == "cuda"
+        self._probed_length = 0
+        if self._autotune:
+            self.batch_size = self._autotune_batch_size(self._max_length if compile_model else 128)
+            if compile_model:
+                self._autotune = False
+        print(f"Using batch_size={self.batch_size}")
+        
+        self._pad_multiple = None
+        if compile_model:
+            mode = "reduce-overhead" if self.device.type == "cuda" else "default"
+            self.model = torch.compile(self.model, mode=mode, fullgraph=False)
+            self._pad_multiple = 32
+            self._warmup()
+        
         self.id2label = self._load_label_mapping(model_path)
+        # Decode predictions with the model's own label mapping, which covers every
+        # output id even when self.id2label falls back to the default labels
+        model_id2label = self.model.config.id2label
+        self._id2label_arr = np.array([model_id2label[i] for i in range(len(model_id2label))], dtype=object)
+        # Entity tag and "B-" flag per label id, used to group tokens into spans
+        self._label_tags = np.array(
+            [label[2:] if label[:2] in ("B-", "I-") else label for label in self._id2label_arr], dtype=object
+        )
+        self._label_begins = np.array([label.startswith("B-") for label in self._id2label_arr])
         self.entity_classes = self._get_entity_classes()
+        self._class_names = tuple(self.entity_classes.keys())
+        self._class_names_lower = tuple(class_name.lower() for class_name in self._class_names)
+        # Aggregated entity group (upper-cased) -> entity class, for groups that have one
+        self._group_to_class = {}
+        for group in set(self._label_tags) - {"O"}:
+            class_name = group.upper().split("-")[-1]
+            if class_name in self.entity_classes:
+                self._group_to_class[group.upper()] = class_name
+        
+        print(f"Available entity classes: {list(self._class_names)}")
+    
+    def _dummy_inputs(self, batch_size: int, length: int) -> Dict[str, torch.Tensor]:
+        """Build a padded batch of empty texts with the given shape."""
+        enc = self.tokenizer([""] * batch_size, padding='max_length', max_length=length, return_tensors='pt')
+        return dict(enc)
+    
+    @torch.inference_mode()
+    def _autotune_batch_size(self, seq_len: int = 128, headroom: float = 0.8) -> int:
+        """
+        Pick the largest batch size that fits on the GPU.
         
-        print(f"Available entity classes: {list(self.entity_classes.keys())}")
+        Runs dummy batches of ``seq_len`` tokens at growing sizes and keeps the
+        largest one whose peak allocated memory stayed under ``headroom`` of the
+        GPU's total memory, stopping at the first size that runs out of memory
+        or goes over it.
+        """
+        seq_len = min(seq_len, self._max_length)
+        total_memory = torch.cuda.mem_get_info(self.device)[1]
+        best = 1
+        for candidate in (4, 8, 16, 32, 64, 128):
+            torch.cuda.reset_peak_memory_stats(self.device)
+            try:
+                self._launch(self._dummy_inputs(candidate, seq_len))[0].cpu()
+            except RuntimeError as e:
+                # torch.cuda.OutOfMemoryError (a RuntimeError) only exists from torch 1.13
+                if "out of memory" not in str(e):
+                    raise
+                torch.cuda.empty_cache()
+                break
+            if torch.cuda.max_memory_allocated(self.device) > headroom * total_memory:
+                break
+            best = candidate
+        torch.cuda.empty_cache()
+        self._probed_length = seq_len
+        print(f"Autotuned batch_size={best} for {seq_len}-token inputs")
+        return best
+    
+    @torch.inference_mode()
+    def _warmup(self) -> None:
+        """Run the compiled model on dummy batches at the two shortest padded lengths."""
+        start = time.perf_counter()
+        for length in (self._pad_multiple, 2 * self._pad_multiple):
+            self._launch(self._dummy_inputs(self.batch_size, length))[0].cpu()
+        print(f"Compiled model warmed up in {time.perf_counter() - start:.1f}s")
     
     def _load_label_mapping(self, model_path: str) -> Dict[int, str]:
         """Load label mapping from config."""
@@ -69,127 +204,386 @@ class BERTNERInference:
             4: "I-EVENT"
         }
     
-    def _get_entity_classes(self) -> Dict[str, List[str]]:
-        """Get available entity classes from label mapping."""
+    def _get_entity_classes(self) -> Mapping[str, Tuple[str, ...]]:
+        """Get available entity classes from label mapping, as a read-only mapping."""
         classes = {}
         for label in self.id2label.values():
             if label != "O":
-                class_name = label.split("-")[-1]
-                if class_name not in classes:
-                    classes[class_name] = []
-                classes[class_name].append(label)
-        return classes
+                classes.setdefault(label.split("-")[-1], []).append(label)
+        return MappingProxyType({class_name: tuple(labels) for class_name, labels in classes.items()})
+    
+    def _empty_entities(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return a fresh result dict with no entities for any class."""
+        return {class_name: [] for class_name in self._class_names}
+    
+    def _encode(self, texts: List[str]):
+        """
+        Tokenize a batch on the CPU.
+        
+        Returns the model inputs (in page-locked memory on GPU so the copy to the
+        device can run asynchronously), the token offsets and a mask of the tokens
+        that belong to the text rather than special or padding tokens.
+        """
+        enc = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self._max_length,
+            pad_to_multiple_of=self._pad_multiple,
+            return_tensors='pt',
+            return_offsets_mapping=True,
+            return_special_tokens_mask=True
+        )
+        offsets = enc.pop('offset_mapping').numpy()
+        token_mask = ((enc.pop('special_tokens_mask') == 0) & (enc['attention_mask'] == 1)).numpy()
+        
+        if self.device.type == "cuda":
+            enc = {k: v.pin_memory() for k, v in enc.items()}
+        return dict(enc), offsets, token_mask
+    
+    def _launch(self, enc: Dict[str, torch.Tensor]):
+        """Queue the forward pass and return per-token scores and label ids on the device."""
+        enc = {k: v.to(self.device, non_blocking=True) for k, v in enc.items()}
+        logits = self.model(**enc).logits.float()
+        # The score is the softmax probability of the top label; computing it from
+        # the logsumexp avoids materialising the full probability tensor
+        top_logits, label_ids = logits.max(-1)
+        return (top_logits - torch.logsumexp(logits, dim=-1)).exp(), label_ids
+    
+    def _aggregate(
+        self,
+        texts: List[str],
+        offsets: np.ndarray,
+        token_mask: np.ndarray,
+        token_scores: np.ndarray,
+        label_ids: np.ndarray
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Aggregate token predictions into entity spans.
+        
+        Adjacent tokens with the same tag form one span unless a token starts with
+        "B-"; "O" spans are dropped. A span's score is the mean of its token scores
+        and its word is the matching slice of the original text.
+        """
+        results = []
+        for i, text in enumerate(texts):
+            tokens = np.flatnonzero(token_mask[i])
+            if len(tokens) == 0:
+                results.append([])
+                continue
+            
+            ids = label_ids[i, tokens]
+            tags = self._label_tags[ids]
+            new_span = self._label_begins[ids].copy()
+            new_span[0] = True
+            new_span[1:] |= tags[1:] != tags[:-1]
+            bounds = np.flatnonzero(new_span).tolist() + [len(tokens)]
+            
+            entities = []
+            for a, b in zip(bounds[:-1], bounds[1:]):
+                if tags[a] == "O":
+                    continue
+                start = int(offsets[i, tokens[a], 0])
+                end = int(offsets[i, tokens[b - 1], 1])
+                entities.append({
+                    'entity_group': tags[a],
+                    'score': token_scores[i, tokens[a:b]].mean(),
+                    'word': text[start:end],
+                    'start': start,
+                    'end': end
+                })
+            results.append(entities)
+        
+        return results
     
+    def _infer_batch(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        """Run the model on a batch of texts and return the entity spans of each."""
+        enc, offsets, token_mask = self._encode(texts)
+        token_scores, label_ids = self._launch(enc)
+        return self._aggregate(texts, offsets, token_mask, token_scores.cpu().numpy(), label_ids.cpu().numpy())
+    
+    def _group_entities(self, entities: List[Dict[str, Any]], confidence_threshold: float) -> Dict[str, List[Dict[str, Any]]]:
+        """Group aggregated entity spans by class, keeping those above the threshold."""
+        grouped_entities = self._empty_entities()
+        
+        for entity in entities:
+            if entity['score'] >= confidence_threshold:
+                label = entity['entity_group'].upper()
+                class_name = self._group_to_class.get(label)
+                
+                if class_name is not None:
+                    grouped_entities[class_name].append({
+                        'text': entity['word'],
+                        'label': label,
+                        'confidence': entity['score'],
+                        'start': entity.get('start', 0),
+                        'end': entity.get('end', 0)
+                    })
+        
+        return grouped_entities
+    
+    @torch.inference_mode()
     def extract_entities(self, text: str, confidence_threshold: float = 0.5) -> Dict[str, List[Dict[str, Any]]]:
         """Extract entities from text."""
         if not text or not isinstance(text, str):
-            return {class_name: [] for class_name in self.entity_classes.keys()}
+            return self._empty_entities()
         
         try:
-            entities = self.ner_pipeline(text)
-            grouped_entities = {class_name: [] for class_name in self.entity_classes.keys()}
-            
-            for entity in entities:
-                if entity['score'] >= confidence_threshold:
-                    label = entity['entity_group'].upper()
-                    class_name = label.split("-")[-1] if "-" in label else label
-                    
-                    if class_name in grouped_entities:
-                        grouped_entities[class_name].append({
-                            'text': entity['word'],
-                            'label': label,
-                            'confidence': entity['score'],
-                            'start': entity.get('start', 0),
-                            'end': entity.get('end', 0)
-                        })
-            
-            return grouped_entities
-            
+            return self._group_entities(self._infer_batch([text])[0], confidence_threshold)
         except Exception as e:
             print(f"Error processing text: {e}")
-            return {class_name: [] for class_name in self.entity_classes.keys()}
+            return self._empty_entities()
     
+    @torch.inference_mode()
     def process_dataframe(
         self, 
         df: pd.DataFrame, 
         text_column: str = 'text',
         id_column: str = 'id',
-        confidence_threshold: float = 0.5
+        confidence_threshold: float = 0.5,
+        dedup: bool = True
     ) -> pd.DataFrame:
-        """Process DataFrame to extract entities."""
-        results = []
+        """
+        Process DataFrame to extract entities, running the model on batches of texts.
+        
+        With ``dedup`` the model only sees each distinct text once and the results
+        are copied to every row with that text.
         
+        Inference runs under torch.inference_mode(), so no autograd graph is
+        recorded and returned tensors cannot be used for gradients.
+        """
         print(f"Processing {len(df)} tweets...")
         
-        for idx, row in df.iterrows():
-            tweet_id = row[id_column]
-            text = str(row[text_column]) if pd.notna(row[text_column]) else ""
-            
-            entities = self.extract_entities(text, confidence_threshold)
+        texts = df[text_column].fillna("").astype(str).tolist()
+        ids = df[id_column].tolist()
+        
+        if dedup:
+            codes, unique_texts = pd.factorize(np.asarray(texts, dtype=object))
+            unique_texts = unique_texts.tolist()
+            print(f"Running inference on {len(unique_texts)} unique texts")
+        else:
+            codes = range(len(texts))
+            unique_texts = texts
+        
+        # Batches are padded to their longest text, so run texts sorted by token
+        # length and scatter the outputs back to the original order
+        if unique_texts and (self.batch_size > 1 or self._autotune):
+            lengths = self.tokenizer(unique_texts, add_special_tokens=False, return_length=True)['length']
+            if self._autotune:
+                # Longest batch this chunk produces, including special tokens and padding
+                longest = min(max(lengths) + self.tokenizer.num_special_tokens_to_add(), self._max_length)
+                if self._pad_multiple:
+                    longest = -(-longest // self._pad_multiple) * self._pad_multiple
+                if longest > self._probed_length:
+                    self.batch_size = self._autotune_batch_size(longest)
+            order = np.argsort(lengths, kind='stable')
+        else:
+            order = np.arange(len(unique_texts))
+        
+        batches = [order[b:b + self.batch_size] for b in range(0, len(order), self.batch_size)]
+        outputs = [None] * len(unique_texts)
+        encoded = self._encode([unique_texts[j] for j in batches[0]]) if batches else None
+        done = 0
+        for n, batch in enumerate(batches):
+            enc, offsets, token_mask = encoded
+            token_scores, label_ids = self._launch(enc)
             
-            result_row = {
-                'id': tweet_id,
-                'text': text
-            }
+            # GPU kernels run asynchronously, so tokenize the next batch before
+            # waiting on this batch's results
+            if n + 1 < len(batches):
+                encoded = self._encode([unique_texts[j] for j in batches[n + 1]])
             
-            for class_name in self.entity_classes.keys():
-                class_entities = entities.get(class_name, [])
-                result_row[f'{class_name.lower()}_entities'] = [e['text'] for e in class_entities]
-                result_row[f'{class_name.lower()}_count'] = len(class_entities)
-                result_row[f'{class_name.lower()}_confidence'] = [e['confidence'] for e in class_entities]
+            batch_texts = [unique_texts[j] for j in batch]
+            spans = self._aggregate(batch_texts, offsets, token_mask, token_scores.cpu().numpy(), label_ids.cpu().numpy())
+            for j, span_entities in zip(batch, spans):
+                outputs[j] = span_entities
             
-            result_row['total_entities'] = sum(len(entities.get(c, [])) for c in self.entity_classes.keys())
-            results.append(result_row)
+            # Report every time another 100 texts have been through the model
+            previous, done = done, done + len(batch)
+            if done // 100 > previous // 100:
+                print(f"Processed {done}/{len(unique_texts)} texts")
+        
+        grouped = [self._group_entities(span_entities, confidence_threshold) for span_entities in outputs]
+        
+        # Accumulate output columns directly instead of one dict per tweet
+        class_columns = {class_name: ([], [], []) for class_name in self._class_names}
+        totals = []
+        
+        for code in codes:
+            entities = grouped[code]
             
-            if (idx + 1) % 100 == 0:
-                print(f"Processed {idx + 1}/{len(df)} tweets")
+            total = 0
+            for class_name, (entity_texts, counts, confidences) in class_columns.items():
+                class_entities = entities.get(class_name, [])
+                entity_texts.append([e['text'] for e in class_entities])
+                counts.append(len(class_entities))
+                confidences.append([e['confidence'] for e in class_entities])
+                total += len(class_entities)
+            totals.append(total)
+        
+        columns = {'id': ids, 'text': texts}
+        for name, (entity_texts, counts, confidences) in zip(self._class_names_lower, class_columns.values()):
+            columns[f'{name}_entities'] = entity_texts
+            columns[f'{name}_count'] = counts
+            columns[f'{name}_confidence'] = confidences
+        columns['total_entities'] = totals
+        
+        return pd.DataFrame(columns)
+    
+    def results_table(self, df: pd.DataFrame) -> pa.Table:
+        """
+        Convert process_dataframe output to an Arrow table.
         
-        return pd.DataFrame(results)
+        Entity and confidence columns are stored as native list<string> and
+        list<float32> columns, so the types stay the same for chunks where every
+        list is empty.
+        """
+        fields = []
+        for col in df.columns:
+            if col == 'total_entities' or col.endswith('_count'):
+                field_type = pa.int64()
+            elif col.endswith('_entities'):
+                field_type = pa.list_(pa.string())
+            elif col.endswith('_confidence'):
+                field_type = pa.list_(pa.float32())
+            elif col == 'text':
+                field_type = pa.string()
+            else:
+                field_type = pa.Array.from_pandas(df[col]).type
+            fields.append(pa.field(col, field_type))
+        return pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
     
-    def save_results(self, df: pd.DataFrame, output_path: str) -> None:
-        """Save results to CSV."""
-        df_save = df.copy()
+    def save_results(self, df: pd.DataFrame, output_path: str, append: bool = False) -> None:
+        """
+        Save results to a zstd-compressed Parquet file, or CSV.
+        
+        A '.parquet' suffix writes Parquet with list columns kept as lists; anything
+        else writes CSV with lists joined by '; ', appending without a header when
+        ``append`` is True. Parquet files cannot be appended to, so chunked output
+        goes through a pyarrow ParquetWriter and results_table instead (see main).
+        """
+        if output_path.endswith('.parquet'):
+            if append:
+                raise ValueError("Parquet output cannot be appended to; write chunks with a pyarrow ParquetWriter")
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+            pq.write_table(self.results_table(df), output_path, compression='zstd')
+            print(f"Results saved to: {output_path}")
+            return
         
-        for col in df_save.columns:
-            if col.endswith('_entities') or col.endswith('_confidence'):
-                df_save[col] = df_save[col].apply(
-                    lambda x: '; '.join([str(item) for item in x]) if x else ''
-                )
+        # Only the joined list columns are new; the other columns are shared with df
+        out_cols = {}
+        for col in df.columns:
+            # List columns; total_entities is a plain count
+            if (col.endswith('_entities') or col.endswith('_confidence')) and col != 'total_entities':
+                out_cols[col] = ['; '.join(map(str, values)) for values in df[col].to_numpy()]
+            else:
+                out_cols[col] = df[col]
         
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-        df_save.to_csv(output_path, index=False, encoding='utf-8')
-        print(f"Results saved to: {output_path}")
+        if not append:
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+        pd.DataFrame(out_cols, copy=False).to_csv(output_path, mode='a' if append else 'w', header=not append, index=False, encoding='utf-8')
+        print(f"Results {'appended' if append else 'saved'} to: {output_path}")
+
+def read_chunks(path: str, chunksize: int, io: str = "pandas") -> Iterator[pd.DataFrame]:
+    """
+    Yield a CSV or Parquet input file as DataFrames of at most ``chunksize`` rows.
+    
+    ``io`` selects the CSV parser: "pandas" (default), "pyarrow" (multi-threaded,
+    streamed block by block into Arrow-backed frames) or "polars" (multi-threaded,
+    parses the whole file before slicing it). Parquet is always read in row batches.
+    """
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif io == "pyarrow":
+        reader = pacsv.open_csv(path)
+        buffered = []
+        buffered_rows = 0
+        for batch in reader:
+            buffered.append(batch)
+            buffered_rows += batch.num_rows
+            while buffered_rows >= chunksize:
+                table = pa.Table.from_batches(buffered, schema=reader.schema)
+                yield table.slice(0, chunksize).to_pandas(types_mapper=pd.ArrowDtype)
+                rest = table.slice(chunksize)
+                buffered = rest.to_batches()
+                buffered_rows = rest.num_rows
+        if buffered_rows:
+            yield pa.Table.from_batches(buffered, schema=reader.schema).to_pandas(types_mapper=pd.ArrowDtype)
+    elif io == "polars":
+        if pl is None:
+            raise ImportError("--io polars requires the polars package")
+        for frame in pl.read_csv(path).iter_slices(n_rows=chunksize):
+            yield frame.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, encoding='utf-8')
 
 def main():
     """Main inference function."""
     parser = argparse.ArgumentParser(description="BERT NER Inference")
     
     parser.add_argument("--model-path", "-m", help="Path to trained model directory")
-    parser.add_argument("--input", "-i", required=True, help="Input CSV file")
-    parser.add_argument("--output", "-o", help="Output CSV file")
+    parser.add_argument("--input", "-i", required=True, help="Input CSV or Parquet file")
+    parser.add_argument("--output", "-o", help="Output file, Parquet or CSV by suffix (default: {input_name}_bert_ner.{format})")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet", help="Default output format (default: parquet)")
     parser.add_argument("--text-column", default="text", help="Text column name")
     parser.add_argument("--id-column", default="id", help="ID column name")
     parser.add_argument("--confidence", type=float, default=0.5, help="Confidence threshold")
+    parser.add_argument("--batch-size", type=int, help="Texts per forward pass (default: autotuned to GPU memory, 1 on CPU)")
+    parser.add_argument("--dtype", choices=["float32", "float16", "bfloat16"], help="Model dtype (default: bfloat16/float16 on GPU, float32 on CPU)")
+    parser.add_argument("--no-dedup", action="store_true", help="Run inference on every row, including repeated texts")
+    parser.add_argument("--compile", action="store_true", help="Compile the model with torch.compile")
+    parser.add_argument("--quantize", action="store_true", help="Use int8 dynamic quantization on CPU (faster; entities may differ)")
+    parser.add_argument("--chunksize", type=int, default=10_000, help="Rows read, processed and written per chunk")
+    parser.add_argument("--io", choices=["pandas", "pyarrow", "polars"], default="pandas", help="CSV parser (default: pandas)")
     
     args = parser.parse_args()
     
     if not args.output:
         base_name = os.path.splitext(args.input)[0]
-        args.output = f"{base_name}_bert_ner.csv"
+        args.output = f"{base_name}_bert_ner.{args.format}"
     
-    print(f"Loading data from: {args.input}")
-    df = pd.read_csv(args.input, encoding='utf-8')
-    print(f"Loaded {len(df)} tweets")
+    dtype = getattr(torch, args.dtype) if args.dtype else None
+    inferencer = BERTNERInference(
+        args.model_path,
+        batch_size=args.batch_size,
+        dtype=dtype,
+        compile_model=args.compile,
+        quantize=args.quantize
+    )
     
-    inferencer = BERTNERInference(args.model_path)
-    results_df = inferencer.process_dataframe(df, args.text_column, args.id_column, args.confidence)
-    inferencer.save_results(results_df, args.output)
+    print(f"Streaming data from: {args.input}")
+    total_tweets = 0
+    tweets_with_entities = 0
+    total_entities = 0
     
-    total_entities = results_df['total_entities'].sum()
-    tweets_with_entities = len(results_df[results_df['total_entities'] > 0])
+    writer = None
+    try:
+        for chunk_index, df in enumerate(read_chunks(args.input, args.chunksize, args.io)):
+            print(f"Loaded chunk {chunk_index + 1} ({len(df)} tweets)")
+            results_df = inferencer.process_dataframe(
+                df, args.text_column, args.id_column, args.confidence, dedup=not args.no_dedup
+            )
+            
+            if args.output.endswith('.parquet'):
+                table = inferencer.results_table(results_df)
+                if writer is None:
+                    os.makedirs(os.path.dirname(args.output) if os.path.dirname(args.output) else ".", exist_ok=True)
+                    writer = pq.ParquetWriter(args.output, table.schema, compression='zstd')
+                writer.write_table(table.cast(writer.schema))
+            else:
+                inferencer.save_results(results_df, args.output, append=chunk_index > 0)
+            
+            total_tweets += len(results_df)
+            tweets_with_entities += int((results_df['total_entities'] > 0).sum())
+            total_entities += int(results_df['total_entities'].sum())
+    finally:
+        if writer is not None:
+            writer.close()
+            print(f"Results saved to: {args.output}")
     
     print(f"\n=== INFERENCE SUMMARY ===")
-    print(f"Total tweets processed: {len(results_df)}")
+    print(f"Total tweets processed: {total_tweets}")
     print(f"Tweets with entities: {tweets_with_entities}")
     print(f"Total entities found: {total_entities}")
 